@@ -6,6 +6,37 @@ automata so the UI can work with any engine in a uniform way.
 
 from typing import Any, List, Tuple
 
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # Numba is optional; kernels then run as plain Python
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# 2-bit codes for the table-driven scanners (A=0, C=1, G=2, T=3). Anything
+# else (N, gaps, stray characters) encodes as 4 so scanners can skip it.
+BASE_CODES = {"A": 0, "C": 1, "G": 2, "T": 3}
+INVALID_CODE = 4
+_ENCODE_TABLE = bytes(BASE_CODES.get(chr(b).upper(), INVALID_CODE) for b in range(256))
+
+
+def encode_dna(sequence: str) -> np.ndarray:
+    """Encode a DNA string as a uint8 array of 2-bit base codes.
+
+    Case-insensitive; one byte per character so indices line up with the
+    original string.
+    """
+    raw = sequence.encode("latin-1", "replace").translate(_ENCODE_TABLE)
+    return np.frombuffer(raw, dtype=np.uint8)
+
 
 class AutomataType:
     """Constants for different automata types."""
@@ -4,7 +4,158 @@ Implements DFA creation and pattern matching logic for DNA sequences.
 Builds a clean linear chain DFA matching the reference diagram style.
 """
 
-from automata_base import AutomataType
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from automata_base import AutomataType, BASE_CODES, INVALID_CODE, HAS_NUMBA, encode_dna, njit
+
+# Lockstep lanes per scan (16 x int32 states = one AVX-512 / two AVX2 registers)
+_LANES = 16
+# Below this length the single-lane scan is cheaper than stitching lanes
+_LANE_MIN_LEN = 4096
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _scan(delta, seq, accept_from, last_sym):
+    """Run the DFA table over encoded bases from Q0.
+
+    Returns (match end positions, final state).
+
+    Deliberately generic over pattern length: variants with accept_from,
+    last_sym or the whole table frozen as JIT constants ran no faster, since
+    the serial state-to-state dependency dominates, and each would add
+    compile latency the first time a pattern is used.
+    """
+    # Matches are rare on random DNA, so record a flag per base instead of
+    # branching on every transition, and collect positions afterwards.
+    flags = np.zeros(len(seq), np.uint8)
+    state = 0
+    for i in range(len(seq)):
+        b = seq[i]
+        if b == INVALID_CODE:
+            continue
+        prev_state = state
+        state = delta[prev_state, b]
+        flags[i] = (state == 0) & (prev_state == accept_from) & (b == last_sym)
+    return np.flatnonzero(flags), state
+
+
+def _scan_py(delta, seq, accept_from, last_sym):
+    """Pure-Python _scan for installs without Numba (lists beat ndarray indexing)."""
+    rows = delta.tolist()
+    ends = []
+    state = 0
+    for i, b in enumerate(seq.tolist()):
+        if b == INVALID_CODE:
+            continue
+        prev_state = state
+        state = rows[prev_state][b]
+        if state == 0 and prev_state == accept_from and b == last_sym:
+            ends.append(i)
+    return np.array(ends, dtype=np.int64), state
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _resync(delta, seq, accept_from, last_sym, state):
+    """Re-walk a chunk from its true entry state until it meets the Q0 walk.
+
+    Returns (match end positions before the meeting point, meeting index,
+    state at that index). If the walks never meet, the index is len(seq).
+    """
+    out = np.empty(len(seq), np.int64)
+    k = 0
+    guess = 0
+    for i in range(len(seq)):
+        if state == guess:
+            return out[:k], i, state
+        b = seq[i]
+        if b == INVALID_CODE:
+            continue
+        prev_state = state
+        state = delta[prev_state, b]
+        guess = delta[guess, b]
+        if state == 0 and prev_state == accept_from and b == last_sym:
+            out[k] = i
+            k += 1
+    return out[:k], len(seq), state
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _scan_lanes(delta, seq, accept_from, last_sym, v):
+    """Like _scan, but walks v contiguous lanes of seq in lockstep.
+
+    Each tick gathers one transition per lane so LLVM can vectorize the
+    table loads. Lanes start speculatively from Q0 and are stitched with
+    _resync afterwards, the same way chunks are in find_all_matches_parallel.
+    """
+    n = len(seq)
+    lane_len = n // v
+    flags = np.zeros(n, np.bool_)
+    states = np.zeros(v, np.int32)
+    for t in range(lane_len):
+        for j in range(v):
+            i = j * lane_len + t
+            b = seq[i]
+            if b != INVALID_CODE:
+                prev_state = states[j]
+                states[j] = delta[prev_state, b]
+                flags[i] = (states[j] == 0) & (prev_state == accept_from) & (b == last_sym)
+
+    # The last lane also covers the remainder
+    state = states[v - 1]
+    for i in range(v * lane_len, n):
+        b = seq[i]
+        if b == INVALID_CODE:
+            continue
+        prev_state = state
+        state = delta[prev_state, b]
+        flags[i] = (state == 0) & (prev_state == accept_from) & (b == last_sym)
+    states[v - 1] = state
+
+    state = states[0]
+    for j in range(1, v):
+        lo = j * lane_len
+        hi = n if j == v - 1 else lo + lane_len
+        if state != 0:
+            fixed, meet, state = _resync(delta, seq[lo:hi], accept_from, last_sym, state)
+            flags[lo:lo + meet] = False
+            for e in fixed:
+                flags[lo + e] = True
+            if meet == hi - lo:
+                continue
+        state = states[j]
+    return np.flatnonzero(flags), state
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _shift_or_scan(masks, seq, m):
+    """Shift-Or over encoded bases; return end positions of every occurrence."""
+    flags = np.zeros(len(seq), np.uint8)
+    one = np.uint64(1)
+    hit = one << np.uint64(m - 1)
+    state = ~np.uint64(0)
+    for i in range(len(seq)):
+        state = (state << one) | masks[seq[i]]
+        flags[i] = (state & hit) == 0
+    return np.flatnonzero(flags)
+
+
+def _shift_or_scan_py(masks, seq, m):
+    """Pure-Python _shift_or_scan for installs without Numba."""
+    masks = masks.tolist()
+    keep = (1 << m) - 1
+    hit = 1 << (m - 1)
+    state = keep
+    ends = []
+    for i, b in enumerate(seq.tolist()):
+        state = ((state << 1) | masks[b]) & keep
+        if not state & hit:
+            ends.append(i)
+    return np.array(ends, dtype=np.int64)
+
 
 class DFA:
     """
@@ -21,11 +172,11 @@ class DFA:
         """
         self.pattern = pattern.upper()
         self.alphabet = ['A', 'T', 'G', 'C']
-        self.transitions = {}
         self.current_state = 0
         
-        # Build simple linear chain
-        self._build_linear_chain()
+        # (states, 4) int32 table for fast scanning: _delta[state, base_code].
+        # Shared (read-only) between all DFAs built for the same pattern.
+        self._delta = DFA._compile(self.pattern)
 
     def get_type(self):
         """Return automaton type for visualization."""
@@ -68,23 +219,39 @@ class DFA:
             return {(len(self.pattern) - 1, self.pattern[-1])}
         return set()
     
-    def _build_linear_chain(self):
-        """Build a simple linear chain DFA."""
-        n = len(self.pattern)
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _compile(pattern):
+        """Build the simple linear chain DFA as a read-only (states, 4) table."""
+        n = len(pattern)
         
         if n == 0:
-            for sym in self.alphabet:
-                self.transitions[(0, sym)] = 0
-            return
+            delta = np.zeros((1, 4), dtype=np.int32)
+            delta.flags.writeable = False
+            return delta
         
+        delta = np.zeros((n, 4), dtype=np.int32)
         for i in range(n):
-            current_char = self.pattern[i]
+            current_char = pattern[i]
             
-            for sym in self.alphabet:
+            for sym in BASE_CODES:
                 if sym == current_char:
-                    self.transitions[(i, sym)] = 0 if i == n - 1 else i + 1
+                    target = 0 if i == n - 1 else i + 1
                 else:
-                    self.transitions[(i, sym)] = 1 if sym == self.pattern[0] and i != 0 else 0
+                    target = 1 if sym == pattern[0] and i != 0 else 0
+                delta[i, BASE_CODES[sym]] = target
+        delta.flags.writeable = False
+        return delta
+
+    @cached_property
+    def transitions(self):
+        """(state, symbol) -> state dict, rebuilt from the table for the visualizer."""
+        n = max(len(self.pattern), 1)
+        return {
+            (i, sym): int(self._delta[i, BASE_CODES[sym]])
+            for i in range(n)
+            for sym in self.alphabet
+        }
     
     def reset(self):
         """Reset automaton to initial state."""
@@ -101,18 +268,27 @@ class DFA:
         """
         symbol = symbol.upper()
         old_state = self.current_state
-        is_match = False
-        
-        if symbol in self.alphabet:
-            next_state = self.transitions.get((self.current_state, symbol), 0)
-            is_match = (self.current_state == len(self.pattern) - 1 and 
-                       next_state == 0 and 
-                       symbol == self.pattern[-1])
-            self.current_state = next_state
-        
+        _, is_match = self._transition(BASE_CODES.get(symbol, INVALID_CODE))
         description = self._format_transition(old_state, symbol, is_match)
         return (self.current_state, is_match, description)
     
+    def _transition(self, sym_code):
+        """Advance on one encoded base without building a description.
+        
+        Args:
+            sym_code (int): Base code from BASE_CODES (INVALID_CODE is ignored)
+            
+        Returns:
+            tuple: (new_state, is_match)
+        """
+        if sym_code == INVALID_CODE:
+            return (self.current_state, False)
+        old_state = self.current_state
+        self.current_state = int(self._delta[old_state, sym_code])
+        is_match = (old_state == len(self.pattern) - 1 and
+                    sym_code == BASE_CODES.get(self.pattern[-1]))
+        return (self.current_state, is_match)
+    
     def _format_transition(self, old_state, symbol, is_match):
         """Format transition description for display."""
         desc = f"Read '{symbol}': Q{old_state} → Q{self.current_state}"
@@ -151,19 +327,163 @@ class DFA:
         Returns:
             list: List of (start_index, end_index) tuples for matches
         """
-        matches = []
-        self.reset()
+        return self.find_all_matches_encoded(encode_dna(dna_sequence))
+
+    def find_all_matches_encoded(self, seq_u8):
+        """
+        Find all occurrences of pattern in an already encoded sequence.
+        
+        Callers scanning one genome with several patterns should call
+        encode_dna() once and pass the array to every automaton.
+        
+        Args:
+            seq_u8 (np.ndarray): uint8 base codes as produced by encode_dna()
+            
+        Returns:
+            list: List of (start_index, end_index) tuples for matches
+        """
+        n = len(self.pattern)
+        if n == 0 or any(c not in BASE_CODES for c in self.pattern):
+            return []
+
+        # Same rules as step(), but table-driven and without descriptions.
+        # Bases outside ACGT leave the state unchanged, exactly like step().
+        ends, _ = self._scan_encoded(seq_u8)
+        starts = ends - (n - 1)
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def _scan_encoded(self, seq):
+        """Scan encoded bases from Q0; return (match end positions, final state)."""
+        accept_from = len(self.pattern) - 1
+        last_code = BASE_CODES[self.pattern[-1]]
+        if not HAS_NUMBA:
+            return _scan_py(self._delta, seq, accept_from, last_code)
+        if len(seq) >= _LANE_MIN_LEN:
+            return _scan_lanes(self._delta, seq, accept_from, last_code, _LANES)
+        return _scan(self._delta, seq, accept_from, last_code)
+
+    def find_all_matches_parallel(self, dna_sequence, workers=None):
+        """
+        Same result as find_all_matches, scanning chunks on a thread pool.
+        
+        The chain DFA reports non-overlapping matches, so a chunk's matches
+        depend on the state it is entered in, not just on the last
+        len(pattern)-1 bases. Each chunk is therefore scanned speculatively
+        from Q0 in parallel, then re-walked from its true entry state only
+        until both walks reach the same state (usually a few bases).
+        
+        Args:
+            dna_sequence (str): DNA sequence to search
+            workers (int): Number of chunks/threads (default: CPU count)
+            
+        Returns:
+            list: List of (start_index, end_index) tuples for matches
+        """
+        n = len(self.pattern)
+        if n == 0 or any(c not in BASE_CODES for c in self.pattern):
+            return []
+
+        seq = encode_dna(dna_sequence)
+        p = max(1, min(workers or os.cpu_count() or 1, len(seq) // max(n, 1)))
+        if p == 1:
+            return self.find_all_matches_encoded(seq)
+
+        accept_from = n - 1
+        last_code = BASE_CODES[self.pattern[-1]]
+        chunk = len(seq) // p
+        bounds = [(i * chunk, len(seq) if i == p - 1 else (i + 1) * chunk) for i in range(p)]
+
+        with ThreadPoolExecutor(max_workers=p) as pool:
+            results = list(pool.map(lambda b: self._scan_encoded(seq[b[0]:b[1]]), bounds))
+
+        parts = []
+        state = 0
+        for (lo, hi), (ends, final_state) in zip(bounds, results):
+            if state != 0:
+                fixed, meet, state = _resync(self._delta, seq[lo:hi], accept_from, last_code, state)
+                parts.append(fixed + lo)
+                if meet == hi - lo:
+                    continue
+                ends = ends[ends >= meet]
+            parts.append(ends + lo)
+            state = final_state
+
+        ends = np.concatenate(parts)
+        starts = ends - (n - 1)
+        return list(zip(starts.tolist(), ends.tolist()))
+
+
+class ShiftOrDFA(DFA):
+    """
+    Opt-in bit-parallel Shift-Or matcher for patterns <= 64 bases.
+    
+    Meant for headless scans; create_automaton() never builds one, since its
+    matches differ from what DFA mode steps through and draws. Matching
+    reports every occurrence of the pattern, overlapping ones included, like
+    a KMP automaton would; the chain DFA restarts after each match and after
+    partial mismatches, so it can report fewer. Bases outside ACGT break a
+    match here rather than being skipped. The inherited diagram, step() and
+    state descriptions are still the chain DFA's and do not follow these
+    matches.
+    """
+    
+    MAX_PATTERN_LEN = 64
+    
+    def __init__(self, pattern):
+        super().__init__(pattern)
+        if not 0 < len(self.pattern) <= self.MAX_PATTERN_LEN:
+            raise ValueError(f"Shift-Or needs a pattern of 1-{self.MAX_PATTERN_LEN} bases")
+        self._masks = ShiftOrDFA._compile_masks(self.pattern)
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _compile_masks(pattern):
+        """Build the per-base bitmask table B[code] (bit i clear = base matches pattern[i])."""
+        full = (1 << 64) - 1
+        masks = [full] * (INVALID_CODE + 1)
+        for i, ch in enumerate(pattern):
+            if ch in BASE_CODES:
+                masks[BASE_CODES[ch]] &= ~(1 << i)
+        masks = np.array(masks, dtype=np.uint64)
+        masks.flags.writeable = False
+        return masks
+    
+    def find_all_matches_encoded(self, seq_u8):
+        """
+        Find all (possibly overlapping) occurrences in an encoded sequence.
+        
+        Args:
+            seq_u8 (np.ndarray): uint8 base codes as produced by encode_dna()
+            
+        Returns:
+            list: List of (start_index, end_index) tuples for matches
+        """
+        m = len(self.pattern)
+        scan = _shift_or_scan if HAS_NUMBA else _shift_or_scan_py
+        ends = scan(self._masks, seq_u8, m)
+        starts = ends - (m - 1)
+        return list(zip(starts.tolist(), ends.tolist()))
+    
+    def find_all_matches_parallel(self, dna_sequence, workers=None):
+        """
+        Same result as find_all_matches, scanning chunks on a thread pool.
+        
+        Shift-Or only remembers the last len(pattern)-1 bases, so each chunk
+        is simply extended backwards by that overlap.
+        """
+        seq = encode_dna(dna_sequence)
+        m = len(self.pattern)
+        p = max(1, min(workers or os.cpu_count() or 1, len(seq) // m))
+        if p == 1:
+            return self.find_all_matches_encoded(seq)
         
-        for i, base in enumerate(dna_sequence):
-            _, is_match, _ = self.step(base)
-            if is_match:
-                # Pattern ends at position i
-                start = i - len(self.pattern) + 1
-                end = i
-                matches.append((start, end))
+        chunk = len(seq) // p
+        bounds = [(max(0, i * chunk - (m - 1)), len(seq) if i == p - 1 else (i + 1) * chunk)
+                  for i in range(p)]
+        with ThreadPoolExecutor(max_workers=p) as pool:
+            results = list(pool.map(lambda b: self.find_all_matches_encoded(seq[b[0]:b[1]]), bounds))
         
-        self.reset()
-        return matches
+        return [(start + lo, end + lo) for (lo, _), found in zip(bounds, results) for start, end in found]
 
 
 def generate_random_dna(length=100):
@@ -177,5 +497,4 @@ def generate_random_dna(length=100):
         str: Random DNA sequence
     """
     import random
-    bases = ['A', 'T', 'G', 'C']
-    return ''.join(random.choice(bases) for _ in range(length))
+    return ''.join(random.choices('ATGC', k=length))
@@ -5,12 +5,14 @@ Integrates UI layout with automata engine and visualizers.
 """
 
 import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-from ui_layout import MainWindow
 
 def main():
     """Initialize and run the application."""
+    # Imported here so headless users of the engines never load PyQt5
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt
+    from ui_layout import MainWindow
+    
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
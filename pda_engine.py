@@ -8,20 +8,102 @@ This class also provides a simple step() that logs push-style behavior for
 visual continuity, while the actual matches are computed in find_all_matches.
 """
 
-from typing import List, Tuple
-
-from automata_base import BaseAutomaton, AutomataType
-
-
-def _comp(base: str) -> str:
-    return {"A": "T", "T": "A", "G": "C", "C": "G"}.get(base, "?")
+from collections import deque
+from typing import Deque, List, Tuple
+
+import numpy as np
+
+from automata_base import BaseAutomaton, AutomataType, HAS_NUMBA, INVALID_CODE, encode_dna, njit
+
+
+# Complement of a base code is 3 - code (A<->T, C<->G); invalid bases get a
+# value no encoded base can equal, so they never pair.
+_NO_PAIR = 255
+
+# Visual stack height before step() starts sliding
+_STACK_LIMIT = 8
+
+
+@njit(cache=True, inline="always")
+def _to_words(a):
+    """Copy bytes into a zero-padded uint64 array (one spare word at the end)."""
+    padded = np.zeros((len(a) + 15) // 8 * 8, np.uint8)
+    padded[:len(a)] = a
+    return padded.view(np.uint64)
+
+
+@njit(cache=True, inline="always")
+def _load_u64(words, i):
+    """Little-endian 8 bytes starting at byte offset i, from two aligned words."""
+    q = i >> 3
+    shift = np.uint64((i & 7) * 8)
+    if shift == 0:
+        return words[q]
+    return (words[q] >> shift) | (words[q + 1] << (np.uint64(64) - shift))
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _find_comp_palindromes(seq_u8, rc_u8, min_len):
+    """Expand around every even center; return an (k, 2) array of (L, R).
+
+    Each center yields at most one maximal span and distinct centers give
+    distinct spans, so no de-duplication is needed; rows are sorted by (L, R).
+    """
+    n = len(seq_u8)
+    out = np.empty((max(n - 1, 0), 2), np.int64)
+    # rc_words holds the complement reversed (rc_u8[l - j] is its byte
+    # n - 1 - l + j), so the leftward walk becomes a forward word load.
+    rc_words = _to_words(rc_u8[::-1])
+    seq_words = _to_words(seq_u8)
+    k = 0
+    # even-length complement palindromes around centers (i, i+1)
+    for i in range(n - 1):
+        l = i
+        r = i + 1
+        while l >= 0 and r < n and rc_u8[l] == seq_u8[r]:
+            l -= 1
+            r += 1
+            # Long stretch (hairpin stems): compare 8 bases per step, then let
+            # the byte loop locate the exact mismatch inside the failing word.
+            if r - l >= 16:
+                while l >= 7 and r + 8 <= n and _load_u64(rc_words, n - 1 - l) == _load_u64(seq_words, r):
+                    l -= 8
+                    r += 8
+        # after loop, last valid was (l+1, r-1)
+        if r - l - 1 >= min_len:
+            out[k, 0] = l + 1
+            out[k, 1] = r - 1
+            k += 1
+    # odd-length variants are uncommon for perfect complement palindromes;
+    # skip for clarity. Could be added by also expanding from (i-1, i+1).
+
+    # Centers emit spans in L+R order; a longer span can start before the
+    # previous one, so reorder by (L, R) with a single unique int64 key.
+    out = out[:k]
+    return out[np.argsort(out[:, 0] * n + out[:, 1])]
+
+
+def _find_comp_palindromes_py(seq, comp, min_len):
+    """Pure-Python _find_comp_palindromes over code bytes, for installs without Numba."""
+    n = len(seq)
+    matches = []
+    for i in range(n - 1):
+        l, r = i, i + 1
+        while l >= 0 and r < n and comp[l] == seq[r]:
+            l -= 1
+            r += 1
+        if r - l - 1 >= min_len:
+            matches.append((l + 1, r - 1))
+    matches.sort()
+    return matches
 
 
 class PDA(BaseAutomaton):
     def __init__(self, pattern: str = "PALINDROME", min_len: int = 4):
         super().__init__(pattern, AutomataType.PDA)
         self.min_len = max(2, int(min_len))
-        self.stack: List[str] = []
+        # Sliding window of the last _STACK_LIMIT symbols; append evicts the bottom
+        self.stack: Deque[str] = deque(maxlen=_STACK_LIMIT)
         self.pos = 0
         self.mode = "push"  # UI-friendly label; not a formal construction here
 
@@ -46,19 +128,21 @@ class PDA(BaseAutomaton):
     def step(self, symbol: str):
         """Process one symbol (for visualization only)."""
         symbol = symbol.upper()
-        before = list(self.stack)
-        self.stack.append(symbol)
-        self.pos += 1
-        
         action = "PUSH"
-        if len(self.stack) > 8:
+        evicted = ""
+        if len(self.stack) == _STACK_LIMIT:
             self.mode = "pop"
-            self.stack.pop(0)
+            evicted = self.stack[0]
             action = "SHIFT"
         else:
             self.mode = "push"
+        self.stack.append(symbol)
+        self.pos += 1
         
-        desc = f"Read '{symbol}': mode={self.mode}, {action}, stack={''.join(before)}→{''.join(self.stack)}"
+        # Previous stack = evicted bottom + current stack minus the new top
+        after = ''.join(self.stack)
+        before = evicted + after[:len(after) - len(symbol)]
+        desc = f"Read '{symbol}': mode={self.mode}, {action}, stack={before}→{after}"
         return (self.mode, False, desc)
 
     def get_state_description(self, state) -> str:
@@ -68,28 +152,14 @@ class PDA(BaseAutomaton):
 
     # --------- Core palindrome finder ---------
     def find_all_matches(self, sequence: str) -> List[Tuple[int, int]]:
-        s = sequence.upper()
-        n = len(s)
-        matches: List[Tuple[int, int]] = []
-
-        def expand(l: int, r: int):
-            # expand while s[l] complements s[r]
-            while l >= 0 and r < n and _comp(s[l]) == s[r]:
-                l -= 1
-                r += 1
-            # after loop, last valid was (l+1, r-1)
-            L = l + 1
-            R = r - 1
-            if R - L + 1 >= self.min_len:
-                matches.append((L, R))
-
-        # even-length complement palindromes around centers (i, i+1)
-        for i in range(n - 1):
-            expand(i, i + 1)
-
-        # odd-length variants are uncommon for perfect complement palindromes;
-        # skip for clarity. Could be added by expand(i-1, i+1) if needed.
-
-        # de-duplicate and sort
-        matches = sorted(set(matches))
+        return self.find_all_matches_encoded(encode_dna(sequence))
+
+    def find_all_matches_encoded(self, seq_u8: np.ndarray) -> List[Tuple[int, int]]:
+        """Like find_all_matches, for a sequence already passed through encode_dna()."""
+        # comp[l] == seq[r] is the complement-pairing test for positions l, r
+        comp = np.where(seq_u8 == INVALID_CODE, _NO_PAIR, 3 - seq_u8.astype(np.int16)).astype(np.uint8)
+        if not HAS_NUMBA:
+            return _find_comp_palindromes_py(seq_u8.tobytes(), comp.tobytes(), self.min_len)
+        found = _find_comp_palindromes(seq_u8, comp, self.min_len)
+        matches: List[Tuple[int, int]] = [tuple(m) for m in found.tolist()]
         return matches
@@ -3,9 +3,10 @@ PDA Visualizer
 Renders a visual stack representation for PDA engines with improved 3D appearance.
 """
 
+import numpy as np
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush, QLinearGradient
+from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush, QGradient, QLinearGradient, QPixmap
 
 
 class PDAVisualizer(QWidget):
@@ -18,6 +19,11 @@ class PDAVisualizer(QWidget):
         self.zoom = 1.0
         self.min_zoom = 0.5
         self.max_zoom = 3.0
+        # Pens/brushes/fonts for stack cells, rebuilt only when zoom changes
+        self._cached_styles = None
+        # Background + badges, re-rendered only when the paintEvent key changes
+        self._bg_pixmap = None
+        self._bg_key = None
         self.setFocusPolicy(Qt.StrongFocus)
 
     def set_automaton(self, automaton):
@@ -30,7 +36,27 @@ class PDAVisualizer(QWidget):
         self.update()
 
     def paintEvent(self, event):
+        # Background and badges only change with size, pixel ratio (screen
+        # DPI), state or stack height
+        key = (self.width(), self.height(), self.devicePixelRatioF(),
+               self.control_state, len(self.stack))
+        if self._bg_pixmap is None or self._bg_key != key:
+            self._bg_pixmap = self._render_background()
+            self._bg_key = key
+
         p = QPainter(self)
+        p.drawPixmap(0, 0, self._bg_pixmap)
+        p.setRenderHint(QPainter.Antialiasing)
+
+        # Draw stack visualizer
+        self._draw_stack(p)
+
+    def _render_background(self):
+        """Render the gradient background, state badge and stack label."""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        p = QPainter(pixmap)
         p.setRenderHint(QPainter.Antialiasing)
 
         # Background
@@ -50,9 +76,8 @@ class PDAVisualizer(QWidget):
         p.setFont(QFont('Segoe UI', 10, QFont.Bold))
         p.setPen(QColor(180, 200, 220))
         p.drawText(QRectF(15, 45, self.width()-30, 20), Qt.AlignLeft | Qt.AlignVCenter, stack_label)
-
-        # Draw stack visualizer
-        self._draw_stack(p)
+        p.end()
+        return pixmap
 
     def wheelEvent(self, event):
         """Handle mouse wheel for zoom in/out."""
@@ -79,6 +104,39 @@ class PDAVisualizer(QWidget):
         else:
             super().keyPressEvent(event)
 
+    def _stack_styles(self):
+        """Return pens/brushes/fonts for stack cells at the current zoom."""
+        if self._cached_styles is not None and self._cached_styles['zoom'] == self.zoom:
+            return self._cached_styles
+        arrow_color = QColor(100, 255, 255)
+        # Gradients relative to each cell's rect, so one brush serves every cell
+        top_gradient = QLinearGradient(0, 0, 0, 1)
+        top_gradient.setCoordinateMode(QGradient.ObjectBoundingMode)
+        top_gradient.setColorAt(0, QColor(0, 200, 255, 200))
+        top_gradient.setColorAt(1, QColor(0, 150, 220, 200))
+        cell_gradient = QLinearGradient(0, 0, 0, 1)
+        cell_gradient.setCoordinateMode(QGradient.ObjectBoundingMode)
+        cell_gradient.setColorAt(0, QColor(70, 100, 140, 150))
+        cell_gradient.setColorAt(1, QColor(50, 80, 120, 150))
+        self._cached_styles = {
+            'zoom': self.zoom,
+            'radius': int(8 * self.zoom),
+            'top_brush': QBrush(top_gradient),
+            'cell_brush': QBrush(cell_gradient),
+            'top_pen': QPen(arrow_color, max(2, int(3 * self.zoom))),
+            'cell_pen': QPen(QColor(100, 140, 180), max(1, int(2 * self.zoom))),
+            'arrow_color': arrow_color,
+            'arrow_brush': QBrush(arrow_color),
+            'arrow_pen': QPen(arrow_color, 1),
+            'top_font': QFont('Segoe UI', max(6, int(8 * self.zoom)), QFont.Bold),
+            'symbol_font': QFont('Consolas', max(10, int(14 * self.zoom)), QFont.Bold),
+            'pos_font': QFont('Segoe UI', max(6, int(8 * self.zoom))),
+            'top_text': QColor(255, 255, 255),
+            'cell_text': QColor(200, 220, 240),
+            'pos_text': QColor(140, 160, 180),
+        }
+        return self._cached_styles
+
     def _draw_stack(self, p):
         """Draw a vertical stack representation with zoom support."""
         if not self.stack:
@@ -105,23 +163,22 @@ class PDAVisualizer(QWidget):
         floor_rect = QRectF(stack_x - 10 * self.zoom, floor_y, stack_width + 20 * self.zoom, 8 * self.zoom)
         p.drawRoundedRect(floor_rect, int(4 * self.zoom), int(4 * self.zoom))
         
+        # Cell geometry for the whole stack at once (bottom to top)
+        styles = self._stack_styles()
+        top_index = len(self.stack) - 1
+        y_coords = floor_y - (np.arange(len(self.stack)) + 1) * (cell_height + cell_margin)
+        x = stack_x
+        
         # Draw each stack element from bottom to top
-        for i, sym in enumerate(self.stack):
-            # Position: bottom to top
-            y = floor_y - (i + 1) * (cell_height + cell_margin)
-            x = stack_x
-            
+        for i, (y, sym) in enumerate(zip(y_coords.tolist(), self.stack)):
             rect = QRectF(x, y, stack_width, cell_height)
             
             # Highlight top of stack (most recently added)
-            is_top = (i == len(self.stack) - 1)
+            is_top = (i == top_index)
             if is_top:
                 # Top element - bright cyan/blue with glow
-                gradient = QLinearGradient(x, y, x, y + cell_height)
-                gradient.setColorAt(0, QColor(0, 200, 255, 200))
-                gradient.setColorAt(1, QColor(0, 150, 220, 200))
-                p.setBrush(QBrush(gradient))
-                p.setPen(QPen(QColor(100, 255, 255), max(2, int(3 * self.zoom))))
+                p.setBrush(styles['top_brush'])
+                p.setPen(styles['top_pen'])
                 
                 # Draw arrow pointing to top
                 arrow_x = x - arrow_offset
@@ -131,39 +188,33 @@ class PDAVisualizer(QWidget):
                     QPointF(arrow_x - arrow_length, arrow_y),
                     QPointF(arrow_x, arrow_y + 8 * self.zoom)
                 ]
-                p.setBrush(QBrush(QColor(100, 255, 255)))
-                p.setPen(QPen(QColor(100, 255, 255), 1))
+                p.setBrush(styles['arrow_brush'])
+                p.setPen(styles['arrow_pen'])
                 p.drawPolygon(arrow_points)
                 
                 # Draw "TOP" label
-                top_font = QFont('Segoe UI', max(6, int(8 * self.zoom)), QFont.Bold)
-                p.setFont(top_font)
-                p.setPen(QColor(100, 255, 255))
+                p.setFont(styles['top_font'])
+                p.setPen(styles['arrow_color'])
                 p.drawText(QRectF(arrow_x - 35 * self.zoom, arrow_y - 10 * self.zoom, 30 * self.zoom, 20 * self.zoom), 
                           Qt.AlignCenter, "TOP")
             else:
                 # Regular stack elements with gradient
-                gradient = QLinearGradient(x, y, x, y + cell_height)
-                gradient.setColorAt(0, QColor(70, 100, 140, 150))
-                gradient.setColorAt(1, QColor(50, 80, 120, 150))
-                p.setBrush(QBrush(gradient))
-                p.setPen(QPen(QColor(100, 140, 180), max(1, int(2 * self.zoom))))
+                p.setBrush(styles['cell_brush'])
+                p.setPen(styles['cell_pen'])
             
             # Draw cell
-            p.drawRoundedRect(rect, int(8 * self.zoom), int(8 * self.zoom))
+            p.drawRoundedRect(rect, styles['radius'], styles['radius'])
             
             # Draw symbol
-            symbol_font = QFont('Consolas', max(10, int(14 * self.zoom)), QFont.Bold)
-            p.setFont(symbol_font)
-            p.setPen(QColor(255, 255, 255) if is_top else QColor(200, 220, 240))
+            p.setFont(styles['symbol_font'])
+            p.setPen(styles['top_text'] if is_top else styles['cell_text'])
             p.drawText(rect, Qt.AlignCenter, sym)
             
             # Draw position indicator
             if not is_top:
-                pos_font = QFont('Segoe UI', max(6, int(8 * self.zoom)))
-                p.setFont(pos_font)
-                p.setPen(QColor(140, 160, 180))
-                pos_text = f"[{len(self.stack) - i - 1}]"
+                p.setFont(styles['pos_font'])
+                p.setPen(styles['pos_text'])
+                pos_text = f"[{top_index - i}]"
                 p.drawText(QRectF(x + stack_width + 10 * self.zoom, y, 30 * self.zoom, cell_height), 
                           Qt.AlignVCenter, pos_text)
         
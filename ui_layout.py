@@ -11,7 +11,7 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 
-from automata_base import AutomataType
+from automata_base import AutomataType, encode_dna
 from automata_factory import create_automaton, available_types
 from automata_engine import DFA, generate_random_dna
 from dna_visualizer import DNAVisualizer
@@ -31,6 +31,9 @@ class MainWindow(QMainWindow):
         self.simulation_timer = None
         self.simulation_index = 0
         self.simulation_speed = 300  # ms per step
+        # DNA text and its encode_dna() form, reused across match queries
+        self._encoded_source = None
+        self._encoded_dna = None
         
         self._init_ui()
         self._apply_styles()
@@ -561,7 +564,7 @@ class MainWindow(QMainWindow):
                 # For all automata types, we need to compute the match position
                 # Get all matches up to current position
                 dna_sequence = self.dna_input.toPlainText().strip().upper().replace(" ", "").replace("\n", "")
-                current_matches = self.engine.find_all_matches(dna_sequence[:self.simulation_index + 1])
+                current_matches = self._find_matches(dna_sequence, self.simulation_index + 1)
                 
                 # Find matches that end at current position
                 for start, end in current_matches:
@@ -585,6 +588,15 @@ class MainWindow(QMainWindow):
         
         self.simulation_index += 1
     
+    def _find_matches(self, dna_sequence, end=None):
+        """Run the engine's matcher on dna_sequence[:end], encoding the DNA only once."""
+        if not hasattr(self.engine, 'find_all_matches_encoded'):
+            return self.engine.find_all_matches(dna_sequence[:end])
+        if self._encoded_source != dna_sequence:
+            self._encoded_source = dna_sequence
+            self._encoded_dna = encode_dna(dna_sequence)
+        return self.engine.find_all_matches_encoded(self._encoded_dna[:end])
+    
     def _finish_simulation(self):
         """Finish simulation and display results."""
         if self.simulation_timer:
@@ -597,7 +609,7 @@ class MainWindow(QMainWindow):
         # Find all matches
         dna_sequence = self.dna_input.toPlainText().strip().upper().replace(" ", "").replace("\n", "")
         try:
-            matches = self.engine.find_all_matches(dna_sequence)
+            matches = self._find_matches(dna_sequence)
         except Exception:
             matches = []
         